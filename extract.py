@@ -1,31 +1,98 @@
 import sys
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urldefrag, urljoin, urlsplit
 import random
 
-def get_urls_from_page(url, driver):
+# hrefs that never lead to another crawlable page
+BAD_HREF_PREFIXES = ('mailto:', 'javascript:', 'data:', 'tel:', '#')
+# only the first few characters can match, so lowercase just that slice
+BAD_HREF_PROBE = max(len(prefix) for prefix in BAD_HREF_PREFIXES)
+
+def get_page_source(url, driver):
+    # returns (final url after redirects, page source); links resolve against the former
+    if isinstance(driver, httpx.Client):
+        try:
+            # stream so the body is only downloaded once the headers say it's html
+            with driver.stream('GET', url, follow_redirects=True, timeout=15) as resp:
+                if 'html' not in resp.headers.get('content-type', '').lower():
+                    return str(resp.url), ''
+                resp.read()
+                return str(resp.url), resp.text
+        except (httpx.HTTPError, httpx.InvalidURL, UnicodeError):
+            return url, ''
     driver.get(url)
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, 'html.parser')
-    links = soup.find_all('a', href=True)
-    return [urljoin(url, link['href']) for link in links]
+    return driver.current_url, driver.page_source
+
+def is_navigable(href):
+    return bool(href) and not href[:BAD_HREF_PROBE].lower().startswith(BAD_HREF_PREFIXES)
+
+# characters urlsplit strips (tab/CR/LF), drops when empty (';' params) or
+# validates ('[' ']' hosts); hrefs containing them always go through urljoin
+SLOW_HREF_CHARS = '\t\r\n;[]'
+
+def resolve_href(url, base, href):
+    # handle the common shapes without re-parsing the base url for every link;
+    # anything urljoin would rewrite (the characters above, an empty query or
+    # fragment, an empty host, non-ascii hosts it validates, a non-http base)
+    # takes the slow path so both return the same string
+    if (base.scheme not in ('http', 'https') or not href.isascii()
+            or any(c in href for c in SLOW_HREF_CHARS)
+            or '?#' in href or href.endswith(('?', '#'))):
+        return urljoin(url, href)
+    if href.startswith(('http://', 'https://', '//')):
+        if href.partition('//')[2][:1] in ('', '/', '?', '#'):
+            return urljoin(url, href)
+        if href.startswith('//'):
+            return f"{base.scheme}:{href}"
+        return href
+    if href.startswith('/') and '/.' not in href:
+        return f"{base.scheme}://{base.netloc}{href}"
+    return urljoin(url, href)
+
+def get_urls_from_page(url, driver):
+    url, page_source = get_page_source(url, driver)
+    anchors = LexborHTMLParser(page_source).css('a[href]')
+    hrefs = [(a.attributes.get('href') or '').strip() for a in anchors]
+    base = urlsplit(url)
+    urls = []
+    for href in hrefs:
+        if not is_navigable(href):
+            continue
+        try:
+            urls.append(resolve_href(url, base, href))
+        except ValueError:
+            # urljoin rejects malformed hosts such as an unbalanced IPv6 bracket
+            continue
+    return urls
 
 def recursively_parse_and_print_urls(url, driver):
-    urls = get_urls_from_page(url, driver)
-    print(f"URLs found on {url}:")
-    for url in urls:
-        print(url)
-        recursively_parse_and_print_urls(url, driver)
+    # explicit stack instead of real recursion so deep sites can't blow the frame limit
+    stack = [url]
+    # keyed on the url without its fragment: /page#a and /page#b are the same fetch
+    visited = set()
+    while stack:
+        url = stack.pop()
+        page = urldefrag(url).url
+        if page in visited:
+            continue
+        visited.add(page)
+        urls = get_urls_from_page(url, driver)
+        print(f"URLs found on {url}:")
+        for link in urls:
+            print(link)
+        # reversed so pages are still visited in document order, as the recursion did;
+        # already-visited links are skipped here so they never pile up on the stack
+        stack.extend(
+            link for link in reversed(urls) if urldefrag(link).url not in visited
+        )
 
 def randomly_parse_and_print_urls(url, driver):
-    driver.get(url)
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, 'html.parser')
-    links = soup.find_all('a', href=True)
-    rand_link = random.choice(links)
-    link = urljoin(url, rand_link['href'])
+    urls = get_urls_from_page(url, driver)
+    if not urls:
+        # dead end: no followable links, or the page could not be fetched
+        return
+    link = random.choice(urls)
     print(link)
     randomly_parse_and_print_urls(link, driver)
 
@@ -35,12 +102,7 @@ def iteratively_parse_and_print_urls(url, driver):
     stack = [(url, 0)]
     while stack:
         url, depth = stack.pop()
-        driver.get(url)
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
-        links = soup.find_all('a', href=True)
-        for link in links:
-            absolute_link = urljoin(url, link['href'])
+        for absolute_link in get_urls_from_page(url, driver):
             print(absolute_link)
             if depth < MAX_DEPTH:
                 stack.append((absolute_link, depth + 1))
@@ -48,15 +110,25 @@ def iteratively_parse_and_print_urls(url, driver):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python script.py <url>")
+    args = sys.argv[1:]
+    use_js = '--js' in args
+    args = [arg for arg in args if arg != '--js']
+    if len(args) != 1:
+        print("Usage: python script.py [--js] <url>")
         sys.exit(1)
 
-    starting_url = sys.argv[1]
+    starting_url = args[0]
+
+    if use_js:
+        # only pull in Selenium when pages need JavaScript to render their links
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
 
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run Chrome in headless mode (no GUI)
-    driver = webdriver.Chrome(options=chrome_options)
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run Chrome in headless mode (no GUI)
+        driver = webdriver.Chrome(options=chrome_options)
+    else:
+        driver = httpx.Client(http2=True, limits=httpx.Limits(max_connections=64))
 
     try:
         # for url in get_urls_from_page(starting_url, driver):
@@ -65,4 +137,7 @@ if __name__ == "__main__":
         iteratively_parse_and_print_urls(starting_url, driver)
 
     finally:
-        driver.quit()
+        if use_js:
+            driver.quit()
+        else:
+            driver.close()